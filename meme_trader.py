@@ -6,21 +6,34 @@
 # Title screen with ASCII art flair (inspired by retro terminal games like Asteroids/Pac-Man borders).
 # Main dashboard with borders, colors, and simple meme icons; shows live deviation and total value.
 # Fully automated trading (q to quit, r to reset, s to sell all after 10s); INITIAL_BALANCE=50.0; sim fees (0.05% per trade).
-# KuCoin WebSocket: Fetches public token, connects to dynamic endpoint, subscribes to /market/ticker:SYMBOL-USDT individually with delays, with CCXT fallback.
+# KuCoin WebSocket: Fetches public token, connects to dynamic endpoint, subscribes to /market/ticker:SYMBOL-USDT for all coins in one frame, with REST level1 fallback.
 # Changes from v3.7.2: Sells only when profit > 0 after fee, added bid/ask prices, dynamic thresholds, COOLDOWN_SEC=0.5, CPU throttling, fixed sell-all with delay.
 import requests
+from requests.adapters import HTTPAdapter
 import websocket
 import json
 import threading
+import collections
+import heapq
+import operator
+import queue
+import random
 import time
 import curses
-import ccxt
 import logging
 import psutil  # For CPU throttling
+try:
+    import orjson  # Faster parsing for the per-tick WebSocket frames
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 # Section: Logging Setup
-logging.basicConfig(filename='bot_logs.txt', level=logging.DEBUG,
+LOG_LEVEL = logging.INFO  # Set to logging.DEBUG to trace every tick and skipped coin in bot_logs.txt
+logging.basicConfig(filename='bot_logs.txt', level=LOG_LEVEL,
                     format='%(asctime)s - %(message)s')
+# Checked once so hot paths skip building debug f-strings entirely when DEBUG is off
+DEBUG_ENABLED = logging.getLogger().isEnabledFor(logging.DEBUG)
 
 # Section: Configuration
 SIMULATION_MODE = True
@@ -37,35 +50,75 @@ FEE_PCT = 0.0005  # 0.05% fee per trade
 PADDING = 2
 MAX_INITIAL_RETRIES = 20
 WEBSOCKET_RECONNECT_DELAY = 5
-WEBSOCKET_MAX_RECONNECTS = 10
+WEBSOCKET_MAX_BACKOFF = 60
+STALE_TICK_SEC = 30  # Don't trade while no WebSocket frame of any kind has arrived for this long
+CPU_CHECK_INTERVAL_SEC = 1.0  # How often trading_loop re-samples CPU load for throttling
+TRADE_IDLE_WAIT_SEC = 1.0  # Longest trading_loop sleeps waiting for a tick before re-checking anyway
 API_RETRY_ATTEMPTS = 3
 API_RETRY_DELAY = 2
 COOLDOWN_SEC = 0.5  # Reduced for more trades
 THRESHOLD_TOLERANCE = 0.0001
 TOKEN_RETRY_ATTEMPTS = 3
-start_time = time.time()
+TRADE_LOG_SIZE = 10
+TICK_QUEUE_SIZE = 1000
+DEBUG_LOG_SIZE = 500
+VERBOSE_DEBUG_LOGS = False  # Also keep per-cycle skip messages in debug_logs
+HTTP_TIMEOUT = 5
+TOKEN_TTL_SEC = 23 * 3600  # KuCoin public tokens last ~24h
+WEBSOCKET_PING_FRAME = '{"type":"ping","id":"kp"}'  # KuCoin's keepalive is this text message, not a control-frame payload
+WEBSOCKET_PING_TIMEOUT = 10  # Drop and reconnect if a ping isn't answered in time
+# Derived trading constants, folded once so trading_loop doesn't recompute them per coin per tick
+BUY_TRIGGER_PCT = -THRESHOLD_PCT_BUY + THRESHOLD_TOLERANCE
+SELL_HIGH_TRIGGER_PCT = THRESHOLD_PCT_SELL_HIGH - THRESHOLD_TOLERANCE
+SELL_VOLATILITY_SCALE = THRESHOLD_PCT_SELL_BASE * 100
+TRADE_FEE_USD = TRADE_AMOUNT_USD * FEE_PCT
+EMA_ALPHA = 2.0 / (EMA_PERIOD + 1)  # Standard EMA smoothing factor
+EMA_DECAY = 1 - EMA_ALPHA
+FEE_MUL = 1 + FEE_PCT  # USDT cost per $1 bought
+FEE_MUL_SELL = 1 - FEE_PCT  # USDT proceeds per $1 sold
+start_time = time.monotonic()
 
 # Section: Global Data
 prices = {}
 changes = {}
 price_histories = {}
+history_sums = {}
+history_sq_sums = {}
 emas = {}
 last_trade_times = {}
 balances = {'USDT': INITIAL_BALANCE}
 invested = {}
 coin_profits = {}
-trade_logs = []
+high_profit = {}  # symbol -> True once profit passes PROFIT_HIGH_MARK of invested, switching to the high sell threshold
+trade_logs = collections.deque(maxlen=TRADE_LOG_SIZE)
 total_profit = 0.0
 total_trades = 0
-debug_logs = []
+debug_logs = collections.deque(maxlen=DEBUG_LOG_SIZE)
 deviations = {}
 bid_prices = {}
 ask_prices = {}
+dirty = threading.Event()  # Set whenever displayed state changes so the dashboard knows to redraw
+tick_event = threading.Event()  # Set by tick_worker after each batch of ticks so trading_loop wakes on new prices instead of polling
+state_lock = threading.Lock()  # Held briefly by writers and by snapshot() so the dashboard never sees half an update
 ws = None
+ws_opened = False
+tick_queue = queue.Queue(maxsize=TICK_QUEUE_SIZE)  # Raw WebSocket frames waiting for tick_worker
 reconnect_attempts = 0
+last_frame_time = 0.0  # Monotonic time of the last WebSocket frame, ticks and pongs alike
+token_cache = {'token': None, 'endpoint': None, 'ping_interval': None, 'expires_at': 0.0}
+row_cache = {}  # symbol -> (row inputs, formatted row) so quiet coins aren't reformatted every redraw
+last_lines = {}  # (row, col) -> (text, attr) last written by draw()
 
-# Section: Exchange Setup
-exchange = ccxt.kucoin()
+# Section: HTTP Session
+# One keep-alive session for KuCoin REST calls so retries and reconnects reuse the TLS connection
+session = requests.Session()
+session.headers.update({'User-Agent': 'meme-trader/3.7.3'})
+session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+def backoff_delay(base, attempt):
+    # Exponential backoff capped at WEBSOCKET_MAX_BACKOFF, plus up to 30% jitter so retries don't line up during an outage
+    delay = min(WEBSOCKET_MAX_BACKOFF, base * 2 ** min(attempt, 16))  # Bound the exponent, run_ws retries forever
+    return delay + random.uniform(0, delay * 0.3)
 
 # Section: Coin Selection
 MEME_COINS = {'DOGE', 'SHIB', 'PEPE', 'BONK', 'FLOKI', 'WIF', 'BRETT', 'MOG', 'CRO', 'GME', 'TRUMP', 'BOME', 'DEGEN', 'MEW', 'SLERF', 'MYRO', 'MAGA', 'TURBO', 'MOTHER', 'KITTY'}
@@ -73,7 +126,7 @@ def get_top_volume_meme_coins():
     url = "https://api.kucoin.com/api/v1/market/allTickers"
     for attempt in range(API_RETRY_ATTEMPTS):
         try:
-            response = requests.get(url)
+            response = session.get(url, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             if 'data' in data and 'ticker' in data['data']:
@@ -84,30 +137,26 @@ def get_top_volume_meme_coins():
             print(f"Error fetching KuCoin allTickers (attempt {attempt + 1}): {e}")
             logging.error(f"KuCoin allTickers fetch failed (attempt {attempt + 1}): {e}")
             if attempt < API_RETRY_ATTEMPTS - 1:
-                time.sleep(API_RETRY_DELAY)
+                time.sleep(backoff_delay(API_RETRY_DELAY, attempt))
             else:
                 trade_logs.append("KuCoin allTickers fetch failed after retries - no coins selected.")
                 logging.error("KuCoin allTickers fetch failed after retries.")
                 return []
-    candidates = []
-    for item in data['data']['ticker']:
-        symbol_pair = item['symbol']
-        if symbol_pair.endswith('-USDT'):
-            symbol = symbol_pair.replace('-USDT', '')
-            if symbol in MEME_COINS:
-                candidates.append({
-                    'name': symbol,
-                    'symbol': symbol,
-                    'id': symbol.lower(),
-                    'kucoin_symbol': symbol_pair,
-                    '24h_change': float(item.get('changeRate', 0)) * 100,
-                    'volValue': float(item.get('volValue', 0))
-                })
-                logging.debug(f"Volume candidate: {symbol} (volume: {item['volValue']}, change: {item['changeRate']})")
-            else:
-                logging.debug(f"Skipped {symbol} - not a meme coin")
-    candidates.sort(key=lambda x: x['volValue'], reverse=True)
-    selected = candidates[:NUM_COINS_TO_TRACK]
+    # One pass over the ~1000 tickers; only the handful of meme pairs ever get a dict built
+    candidates = [
+        {
+            'name': base,
+            'symbol': base,
+            'id': base.lower(),
+            'kucoin_symbol': pair,
+            '24h_change': float(item.get('changeRate') or 0) * 100,
+            'volValue': float(item.get('volValue') or 0)
+        }
+        for item in data['data']['ticker']
+        if (pair := item['symbol']).endswith('-USDT') and (base := pair[:-5]) in MEME_COINS
+    ]
+    logging.debug(f"Volume candidates: {', '.join(c['symbol'] for c in candidates)}")
+    selected = heapq.nlargest(NUM_COINS_TO_TRACK, candidates, key=operator.itemgetter('volValue'))
     if selected:
         log = f"Selected top {len(selected)} meme coins by volume on KuCoin: {', '.join(c['symbol'] for c in selected)} 📈🚀"
         trade_logs.append(log)
@@ -124,28 +173,48 @@ for coin in coins:
     symbol = coin['symbol']
     prices[symbol] = 0.0
     changes[symbol] = 0.0
-    price_histories[symbol] = []
+    price_histories[symbol] = collections.deque(maxlen=EMA_PERIOD)
+    history_sums[symbol] = 0.0
+    history_sq_sums[symbol] = 0.0
     emas[symbol] = 0.0
     last_trade_times[symbol] = 0
     balances[symbol] = 0.0
     invested[symbol] = 0.0
     coin_profits[symbol] = 0.0
+    high_profit[symbol] = False
     deviations[symbol] = 0.0
     bid_prices[symbol] = 0.0
     ask_prices[symbol] = 0.0
+symbols = [coin['symbol'] for coin in coins]
+first_price_events = {symbol: threading.Event() for symbol in symbols}  # Set once a symbol has its first price
+TOPIC_TO_SYMBOL = {f"/market/ticker:{coin['kucoin_symbol']}": coin['symbol'] for coin in coins}
+# KuCoin accepts comma-separated symbols in one topic, so every coin goes in a single subscribe frame,
+# serialized once here instead of on every reconnect
+SUBSCRIBE_PAIRS = ",".join(coin['kucoin_symbol'] for coin in coins)
+SUBSCRIBE_FRAME = json.dumps({
+    "type": "subscribe",
+    "topic": f"/market/ticker:{SUBSCRIBE_PAIRS}",
+    "response": False  # No ack frame needed
+})
 
 # Section: KuCoin WebSocket Setup
 def get_kucoin_token():
+    # Reconnects reuse the cached token until shortly before it expires instead of POSTing again
+    if token_cache['token'] and time.monotonic() < token_cache['expires_at'] - 60:
+        return token_cache['token'], token_cache['endpoint'], token_cache['ping_interval']
     url = "https://api.kucoin.com/api/v1/bullet-public"
     for attempt in range(TOKEN_RETRY_ATTEMPTS):
         try:
-            response = requests.post(url)
+            response = session.post(url, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             if 'data' in data and 'token' in data['data'] and 'instanceServers' in data['data']:
                 token = data['data']['token']
-                endpoint = data['data']['instanceServers'][0]['endpoint']
-                ping_interval = 15  # KuCoin recommends 18s, use 15s for safety
+                server = data['data']['instanceServers'][0]
+                endpoint = server['endpoint']
+                ping_interval = server.get('pingInterval', 18000) / 1000  # Server sends milliseconds
+                token_cache.update(token=token, endpoint=endpoint, ping_interval=ping_interval,
+                                   expires_at=time.monotonic() + TOKEN_TTL_SEC)
                 logging.info(f"Successfully fetched KuCoin token: {token[:10]}..., endpoint: {endpoint}, ping_interval: {ping_interval}s")
                 return token, endpoint, ping_interval
             else:
@@ -154,12 +223,13 @@ def get_kucoin_token():
             print(f"Error fetching KuCoin token (attempt {attempt + 1}): {e}")
             logging.error(f"KuCoin token fetch failed (attempt {attempt + 1}): {e}")
             if attempt < TOKEN_RETRY_ATTEMPTS - 1:
-                time.sleep(API_RETRY_DELAY)
+                time.sleep(backoff_delay(API_RETRY_DELAY, attempt))
             else:
                 raise Exception("Failed to fetch KuCoin public token after retries")
     return None, None, None
 
 # Section: Fallback Price Fetch
+LEVEL1_URL = "https://api.kucoin.com/api/v1/market/orderbook/level1"
 def fetch_fallback_prices():
     while True:
         for coin in coins:
@@ -167,13 +237,17 @@ def fetch_fallback_prices():
             symbol_pair = coin['kucoin_symbol']
             if prices.get(symbol, 0.0) == 0.0:
                 try:
-                    ticker = exchange.fetch_ticker(symbol_pair)
-                    price = float(ticker['last'])
-                    bid = float(ticker['bid'])
-                    ask = float(ticker['ask'])
-                    prices[symbol] = price
-                    bid_prices[symbol] = bid
-                    ask_prices[symbol] = ask
+                    response = session.get(LEVEL1_URL, params={'symbol': symbol_pair}, timeout=HTTP_TIMEOUT)
+                    response.raise_for_status()
+                    ticker = response.json()['data']
+                    price = float(ticker['price'])
+                    bid = float(ticker['bestBid'])
+                    ask = float(ticker['bestAsk'])
+                    with state_lock:
+                        prices[symbol] = price
+                        bid_prices[symbol] = bid
+                        ask_prices[symbol] = ask
+                    first_price_events[symbol].set()
                     logging.debug(f"Fetched fallback price for {symbol}: ${price:.10f}, bid: ${bid:.10f}, ask: ${ask:.10f}")
                 except Exception as e:
                     logging.error(f"Failed to fetch fallback price for {symbol_pair}: {e}")
@@ -185,181 +259,282 @@ fallback_thread.start()
 
 # Section: WebSocket Handling
 def on_message(ws, message):
-    logging.debug(f"Raw WebSocket message: {message}")
-    data = json.loads(message)
-    if 'type' in data and data['type'] == 'pong':
-        logging.debug("Received WebSocket pong")
-    if 'topic' in data and 'data' in data and data['topic'].startswith('/market/ticker:'):
-        payload = data['data']
-        symbol_pair = data['topic'].split(':')[1]
-        symbol = symbol_pair.replace('-USDT', '')
-        price = float(payload['price'])
-        bid = float(payload.get('bestBid', price))
-        ask = float(payload.get('bestAsk', price))
-        change = 0.0
-        if symbol in prices and prices[symbol] > 0:
-            change = (price - prices[symbol]) / prices[symbol] * 100
-        prices[symbol] = price
-        bid_prices[symbol] = bid
-        ask_prices[symbol] = ask
-        changes[symbol] = change
-        if symbol in price_histories:
-            price_histories[symbol].append(price)
-            if len(price_histories[symbol]) > EMA_PERIOD:
-                price_histories[symbol].pop(0)
-            emas[symbol] = sum(price_histories[symbol]) / len(price_histories[symbol]) if price_histories[symbol] else price
-            deviations[symbol] = (price - emas[symbol]) / emas[symbol] * 100 if emas[symbol] > 0 else 0.0
-            logging.debug(f"{symbol} price: ${price:.10f}, EMA: ${emas[symbol]:.10f}, deviation: {deviations[symbol]:.2f}%")
-            logging.debug(f"Balance {symbol}: {balances[symbol]:.4f}, USDT: {balances['USDT']:.2f}")
+    # message is bytes, not str: run_ws passes skip_utf8_validation=True, and websocket-client
+    # only decodes text frames when validating
+    # Only enqueue here so a slow parse/update can never stall the socket reader
+    global last_frame_time
+    last_frame_time = time.monotonic()  # Any frame proves the connection is alive, even if no ticker moved
+    try:
+        tick_queue.put_nowait(message)
+    except queue.Full:
+        try:
+            tick_queue.get_nowait()  # Drop the oldest frame, the newest price matters more
+        except queue.Empty:
+            pass
+        tick_queue.put_nowait(message)
+
+def tick_worker():
+    # Drain whatever piled up behind the first frame so a burst wakes the dashboard
+    # and trading_loop once instead of once per tick
+    while True:
+        message = tick_queue.get()
+        updated = False
+        while True:
+            try:
+                updated = process_tick(message) or updated
+            except Exception as e:
+                logging.error(f"Failed to process WebSocket message: {e}")
+            try:
+                message = tick_queue.get_nowait()
+            except queue.Empty:
+                break
+        if updated:
+            dirty.set()
+            tick_event.set()
+
+def process_tick(message, _loads=json_loads, _topics=TOPIC_TO_SYMBOL, _prices=prices, _changes=changes,
+                 _bids=bid_prices, _asks=ask_prices, _histories=price_histories, _sums=history_sums,
+                 _sq_sums=history_sq_sums, _emas=emas, _deviations=deviations,
+                 _period=EMA_PERIOD, _alpha=EMA_ALPHA, _decay=EMA_DECAY, _debug=DEBUG_ENABLED):
+    # message is the raw bytes frame from on_message (see skip_utf8_validation in run_ws)
+    # Hot globals are bound as default arguments so each tick uses fast local lookups
+    if _debug:
+        logging.debug(f"Raw WebSocket message: {message}")
+    if isinstance(message, str):  # Bytes while run_forever skips UTF-8 validation; don't depend on that flag
+        message = message.encode()
+    # Welcome/ack/pong frames carry no ticker topic, so skip parsing them at all
+    if b'"/market/ticker:' not in message:
+        if _debug and b'"pong"' in message:
+            logging.debug("Received WebSocket pong")
+        return
+    data = _loads(message)
+    symbol = _topics.get(data.get('topic'))
+    if symbol is None or 'data' not in data:
+        return
+    payload = data['data']
+    price = float(payload['price'])
+    bid = float(payload.get('bestBid', price))
+    ask = float(payload.get('bestAsk', price))
+    with state_lock:
+        last_price = _prices[symbol]
+        _changes[symbol] = (price - last_price) / last_price * 100 if last_price > 0 else 0.0
+        _prices[symbol] = price
+        _bids[symbol] = bid
+        _asks[symbol] = ask
+        # Running sums over the window feed trading_loop's volatility estimate in O(1);
+        # the deque evicts the oldest price itself once it reaches EMA_PERIOD
+        history = _histories[symbol]
+        if len(history) == _period:
+            oldest = history[0]
+            _sums[symbol] -= oldest
+            _sq_sums[symbol] -= oldest * oldest
+        history.append(price)
+        _sums[symbol] += price
+        _sq_sums[symbol] += price * price
+        # True exponential moving average, seeded with the first price
+        ema = _emas[symbol]
+        ema = price if ema == 0.0 else _alpha * price + _decay * ema
+        _emas[symbol] = ema
+        deviation = (price - ema) / ema * 100 if ema > 0 else 0.0
+        _deviations[symbol] = deviation
+    if not first_price_events[symbol].is_set():
+        first_price_events[symbol].set()
+    if _debug:
+        logging.debug(f"{symbol} price: ${price:.10f}, EMA: ${ema:.10f}, deviation: {deviation:.2f}%")
+        logging.debug(f"Balance {symbol}: {balances[symbol]:.4f}, USDT: {balances['USDT']:.2f}")
+    return True  # Tells tick_worker state changed; non-ticker frames fall through as None
 
 def on_error(ws, error):
     print(f"WebSocket error: {error}")
     logging.error(f"WebSocket error: {error}")
 
 def on_close(ws, close_status_code, close_msg):
-    global reconnect_attempts
     print("WebSocket closed")
     logging.info(f"WebSocket closed (code: {close_status_code}, msg: {close_msg}) - reconnecting...")
-    reconnect_attempts += 1
-    if reconnect_attempts >= WEBSOCKET_MAX_RECONNECTS:
-        logging.error("Max WebSocket reconnect attempts reached, stopping...")
-        return
-    time.sleep(WEBSOCKET_RECONNECT_DELAY)
-    run_ws()
+
+def on_pong(ws, data):
+    # run_forever's control pings set the cadence; follow each pong with KuCoin's app-level text ping
+    ws.send(WEBSOCKET_PING_FRAME)
 
 def on_open(ws):
-    global reconnect_attempts
+    global reconnect_attempts, ws_opened
     reconnect_attempts = 0
+    ws_opened = True
     log = "WebSocket opened - subscribing to tickers..."
     debug_logs.append(log)
     logging.info(log)
-    for coin in coins:
-        subs = {
-            "type": "subscribe",
-            "topic": f"/market/ticker:{coin['kucoin_symbol']}"
-        }
-        ws.send(json.dumps(subs))
-        logging.debug(f"Subscribed to {coin['kucoin_symbol']}")
-        time.sleep(1)  # Delay to avoid KuCoin limits
+    ws.send(SUBSCRIBE_FRAME)
+    logging.debug(f"Subscribed to {SUBSCRIBE_PAIRS}")
 
 # Section: WebSocket Runner
 def run_ws():
-    global ws
-    token, endpoint, ping_interval = get_kucoin_token()
-    ws_url = f"{endpoint}?token={token}"
-    ws = websocket.WebSocketApp(ws_url, on_open=on_open, on_message=on_message, on_error=on_error, on_close=on_close)
-    ws.run_forever(ping_interval=ping_interval)
+    # Reconnect in a loop on this one thread rather than calling run_ws() from on_close,
+    # which nested a new run_forever inside the closing connection's callback on every drop
+    global ws, ws_opened, reconnect_attempts
+    while True:
+        ws_opened = False
+        # Any failure here, not just the token fetch, must fall through to the backoff below
+        # rather than end the thread and leave the bot without a price feed
+        try:
+            token, endpoint, ping_interval = get_kucoin_token()
+            ws_url = f"{endpoint}?token={token}"
+            ws = websocket.WebSocketApp(ws_url, on_open=on_open, on_message=on_message, on_error=on_error, on_close=on_close, on_pong=on_pong)
+            # websocket-client rejects ping_timeout >= ping_interval, so shrink the timeout if the server pings fast
+            ping_timeout = min(WEBSOCKET_PING_TIMEOUT, ping_interval / 2)
+            ws.run_forever(ping_interval=ping_interval, ping_timeout=ping_timeout, skip_utf8_validation=True)  # Skip the pure-Python UTF-8 check on every ticker frame; frames then reach on_message as bytes
+        except Exception as e:
+            debug_logs.append(f"WS error: {e}")
+            logging.error(f"WebSocket connect failed: {e}")
+        if not ws_opened:
+            token_cache['expires_at'] = 0.0  # Never connected, so the cached token may be bad - fetch a fresh one
+        # Never give up: back off exponentially across consecutive failures, then keep retrying
+        # at WEBSOCKET_MAX_BACKOFF; on_open resets the count
+        reconnect_attempts += 1
+        delay = backoff_delay(WEBSOCKET_RECONNECT_DELAY, reconnect_attempts - 1)
+        logging.info(f"Reconnecting WebSocket in {delay:.2f}s (attempt {reconnect_attempts})")
+        time.sleep(delay)
 
+tick_thread = threading.Thread(target=tick_worker)
+tick_thread.daemon = True
+tick_thread.start()
 thread = threading.Thread(target=run_ws)
 thread.daemon = True
 thread.start()
 time.sleep(10)
 
 # Section: Trade Execution
-def execute_trade(symbol, side, amount_usd):
+def update_sell_mode(symbol):
+    # Called whenever invested or coin_profits change so trading_loop only has to look the flag up
+    inv = invested[symbol]
+    high_profit[symbol] = inv > 0 and coin_profits[symbol] > inv * PROFIT_HIGH_MARK
+
+def execute_buy(symbol, amount_usd):
+    global total_trades
+    price = prices[symbol]
+    if price == 0.0:
+        log = f"Cannot buy {symbol} - price not loaded yet!"
+        debug_logs.append(log)
+        logging.warning(log)
+        return
+    cost = amount_usd * FEE_MUL
+    quantity = amount_usd / ask_prices[symbol]
+    fee = cost - amount_usd
+    log = f"Bought {quantity:.4f} {symbol} for ${amount_usd:.2f} (fee ${fee:.4f})! HODL! 💪"
+    with state_lock:
+        funded = balances['USDT'] >= cost
+        if funded:
+            balances['USDT'] -= cost
+            balances[symbol] += quantity
+            invested[symbol] += amount_usd
+            update_sell_mode(symbol)
+            total_trades += 1
+            trade_logs.append(log)
+    if not funded:
+        log = f"Cannot buy more {symbol} - insufficient USDT!"
+        debug_logs.append(log)
+        logging.warning(log)
+        return
+    dirty.set()
+    debug_logs.append(log)
+    logging.info(log)
+
+def execute_sell(symbol, amount_usd):
     global total_profit, total_trades
-    price = prices.get(symbol, 0.0)
-    bid_price = bid_prices.get(symbol, price)
-    ask_price = ask_prices.get(symbol, price)
+    price = prices[symbol]
     if price == 0.0:
-        log = f"Cannot {side} {symbol} - price not loaded yet!"
+        log = f"Cannot sell {symbol} - price not loaded yet!"
         debug_logs.append(log)
         logging.warning(log)
         return
-    quantity = amount_usd / (ask_price if side == 'buy' else price)
-    fee = amount_usd * FEE_PCT
-    if side == 'buy':
-        if balances['USDT'] < amount_usd + fee:
-            log = f"Cannot buy more {symbol} - insufficient USDT!"
-            debug_logs.append(log)
-            logging.warning(log)
-            return
-        balances['USDT'] -= (amount_usd + fee)
-        balances[symbol] += quantity
-        invested[symbol] += amount_usd
-        log = f"Bought {quantity:.4f} {symbol} for ${amount_usd:.2f} (fee ${fee:.4f})! HODL! 💪"
+    quantity = amount_usd / price
+    proceeds = amount_usd * FEE_MUL_SELL
+    fee = amount_usd - proceeds
+    profit = proceeds - (quantity * bid_prices[symbol])
+    if profit <= 0:
+        log = f"Skipped sell {symbol} - profit ${profit:.4f} not positive!"
         debug_logs.append(log)
-        logging.info(log)
-    elif side == 'sell':
-        if balances[symbol] < quantity:
-            log = f"Not enough {symbol} to sell!"
-            debug_logs.append(log)
-            logging.warning(log)
-            return
-        profit = amount_usd - (quantity * bid_price) - fee
-        if profit <= 0:
-            log = f"Skipped sell {symbol} - profit ${profit:.4f} not positive!"
-            debug_logs.append(log)
-            logging.debug(log)
-            return
-        balances['USDT'] += (amount_usd - fee)
-        balances[symbol] -= quantity
-        coin_profits[symbol] += profit
-        total_profit += profit
-        log = f"Sold {quantity:.4f} {symbol} for ${amount_usd:.2f} (fee ${fee:.4f})! Profit: ${profit:.4f} 🤑"
+        logging.debug(log)
+        return
+    log = f"Sold {quantity:.4f} {symbol} for ${amount_usd:.2f} (fee ${fee:.4f})! Profit: ${profit:.4f} 🤑"
+    with state_lock:
+        # Check and debit under one lock so sell_all can't zero the balance in between
+        held = balances[symbol] >= quantity
+        if held:
+            balances['USDT'] += proceeds
+            balances[symbol] -= quantity
+            coin_profits[symbol] += profit
+            update_sell_mode(symbol)
+            total_profit += profit
+            total_trades += 1
+            trade_logs.append(log)
+    if not held:
+        log = f"Not enough {symbol} to sell!"
         debug_logs.append(log)
-        logging.info(log)
-    total_trades += 1
-    trade_logs.append(log)
-    if len(trade_logs) > 10:
-        trade_logs.pop(0)
+        logging.warning(log)
+        return
+    dirty.set()
+    debug_logs.append(log)
+    logging.info(log)
 
 # Section: Sell All
 def sell_all():
     global total_profit, total_trades
     logging.info("Sell-all triggered, processing...")
-    if time.time() - start_time < 10:  # Wait for initial buys and prices
+    if time.monotonic() - start_time < 10:  # Wait for initial buys and prices
         log = "Sell-all skipped - waiting for initial price data and balances!"
         debug_logs.append(log)
         logging.warning(log)
         return
     for coin in coins:
         symbol = coin['symbol']
-        price = prices.get(symbol, 0.0)
-        bid_price = bid_prices.get(symbol, price)
+        # Read, check and zero the balance under one lock, like execute_buy/execute_sell, so a trade
+        # on another thread can't land between the read and the reset
+        with state_lock:
+            price = prices.get(symbol, 0.0)
+            bid_price = bid_prices.get(symbol, price)
+            balance = balances.get(symbol, 0.0)
+            amount_usd = balance * price
+            fee = amount_usd * FEE_PCT
+            profit = amount_usd - (balance * bid_price) - fee
+            sold = price > 0 and balance > 0 and profit > 0
+            if sold:
+                log = f"Sold all {balance:.4f} {symbol} for ${amount_usd:.2f} (fee ${fee:.4f})! Profit: ${profit:.4f} 🤑"
+                balances['USDT'] += (amount_usd - fee)
+                balances[symbol] = 0.0
+                coin_profits[symbol] += profit
+                update_sell_mode(symbol)
+                total_profit += profit
+                total_trades += 1
+                trade_logs.append(log)
         if price == 0.0:
             log = f"Cannot sell {symbol} - price not loaded yet!"
             debug_logs.append(log)
             logging.warning(log)
             continue
-        balance = balances.get(symbol, 0.0)
         if balance <= 0:
             log = f"Cannot sell {symbol} - no balance to sell!"
             debug_logs.append(log)
             logging.warning(log)
             continue
-        amount_usd = balance * price
-        fee = amount_usd * FEE_PCT
-        profit = amount_usd - (balance * bid_price) - fee
-        if profit <= 0:
+        if not sold:
             log = f"Skipped sell all {symbol} - profit ${profit:.4f} not positive!"
             debug_logs.append(log)
             logging.debug(log)
             continue
-        balances['USDT'] += (amount_usd - fee)
-        balances[symbol] = 0.0
-        coin_profits[symbol] += profit
-        total_profit += profit
-        log = f"Sold all {balance:.4f} {symbol} for ${amount_usd:.2f} (fee ${fee:.4f})! Profit: ${profit:.4f} 🤑"
+        dirty.set()
         debug_logs.append(log)
         logging.info(log)
-        total_trades += 1
-        trade_logs.append(log)
-        if len(trade_logs) > 10:
-            trade_logs.pop(0)
 
 # Section: Initial Buys
 def initial_buys():
     for coin in coins:
         symbol = coin['symbol']
-        retry_count = 0
-        while retry_count < MAX_INITIAL_RETRIES and prices[symbol] == 0.0:
-            logging.debug(f"Waiting for {symbol} price data... retry {retry_count + 1}")
-            time.sleep(2)
-            retry_count += 1
+        logging.debug(f"Waiting for {symbol} price data...")
+        # Wakes as soon as the first price lands instead of polling every 2s
+        first_price_events[symbol].wait(timeout=MAX_INITIAL_RETRIES * 2)
         if prices[symbol] > 0 and balances['USDT'] >= INITIAL_BUY_USD:
-            execute_trade(symbol, 'buy', INITIAL_BUY_USD)
-            last_trade_times[symbol] = time.time()
+            execute_buy(symbol, INITIAL_BUY_USD)
+            last_trade_times[symbol] = time.monotonic()
         else:
             log = f"Initial buy for {symbol} failed - no price or insufficient USDT after retries!"
             trade_logs.append(log)
@@ -370,79 +545,115 @@ initial_thread.start()
 
 # Section: Reset Simulation
 def reset_simulation():
-    global balances, invested, coin_profits, total_profit, total_trades, trade_logs, last_trade_times
-    balances = {'USDT': INITIAL_BALANCE}
-    for coin in coins:
-        symbol = coin['symbol']
-        balances[symbol] = 0.0
-        invested[symbol] = 0.0
-        coin_profits[symbol] = 0.0
-        last_trade_times[symbol] = 0
-    total_profit = 0.0
-    total_trades = 0
-    trade_logs = []
+    global total_profit, total_trades
+    with state_lock:
+        # Reset in place - trading_loop and process_tick hold references to these dicts
+        balances['USDT'] = INITIAL_BALANCE
+        for coin in coins:
+            symbol = coin['symbol']
+            balances[symbol] = 0.0
+            invested[symbol] = 0.0
+            coin_profits[symbol] = 0.0
+            high_profit[symbol] = False
+            last_trade_times[symbol] = 0
+        total_profit = 0.0
+        total_trades = 0
+        trade_logs.clear()
     initial_buys()
     log = "Simulation reset! Fresh start. 🔄"
     trade_logs.append(log)
+    dirty.set()
     logging.info(log)
 
 # Section: Trading Loop
 def trading_loop():
+    # Bind hot globals once so the per-coin loop uses fast local lookups
+    _prices, _emas, _histories, _sums, _sq_sums = prices, emas, price_histories, history_sums, history_sq_sums
+    _last_trades, _balances, _high_profit = last_trade_times, balances, high_profit
+    _bids, _deviations = bid_prices, deviations
+    cpu_busy = False
+    next_cpu_check = 0.0
     while True:
-        current_time = time.time()
-        for coin in coins:
-            symbol = coin['symbol']
-            price = prices.get(symbol, 0.0)
-            ema = emas.get(symbol, 0.0)
-            if price == 0.0 or ema == 0.0:
-                logging.debug(f"Skipping {symbol} - price or EMA not ready")
-                continue
-            if current_time - last_trade_times.get(symbol, 0) < COOLDOWN_SEC:
-                logging.debug(f"Skipping {symbol} - in cooldown (last trade: {last_trade_times[symbol]})")
-                continue
-            # Calculate volatility (standard deviation of last 30 prices)
-            price_history = price_histories.get(symbol, [])
-            if len(price_history) >= EMA_PERIOD:
-                mean = sum(price_history) / len(price_history)
-                variance = sum((x - mean) ** 2 for x in price_history) / len(price_history)
-                volatility = (variance ** 0.5) / mean if mean > 0 else 0.0
-                dynamic_threshold = THRESHOLD_PCT_SELL_BASE * (1 + volatility * 100)
-            else:
-                dynamic_threshold = THRESHOLD_PCT_SELL_BASE
-            deviation = (price - emas[symbol]) / emas[symbol] * 100 if emas[symbol] > 0 else 0.0
-            deviations[symbol] = deviation
-            logging.debug(f"{symbol} deviation: {deviation:.2f}%, dynamic sell threshold: {dynamic_threshold:.3f}%")
-            if deviation <= -THRESHOLD_PCT_BUY + THRESHOLD_TOLERANCE and balances['USDT'] >= TRADE_AMOUNT_USD:
-                execute_trade(symbol, 'buy', TRADE_AMOUNT_USD)
-                last_trade_times[symbol] = current_time
-            sell_threshold = THRESHOLD_PCT_SELL_HIGH if invested[symbol] > 0 and coin_profits[symbol] > invested[symbol] * PROFIT_HIGH_MARK else dynamic_threshold
-            if deviation >= sell_threshold - THRESHOLD_TOLERANCE and balances[symbol] > (TRADE_AMOUNT_USD / price):
-                profit = TRADE_AMOUNT_USD - ((TRADE_AMOUNT_USD / price) * bid_prices.get(symbol, price)) - (TRADE_AMOUNT_USD * FEE_PCT)
-                if profit > 0:
-                    execute_trade(symbol, 'sell', TRADE_AMOUNT_USD)
-                    last_trade_times[symbol] = current_time
+        # Sleep until a tick arrives; clearing before the scan means a tick landing mid-scan wakes the next pass
+        tick_event.wait(TRADE_IDLE_WAIT_SEC)
+        tick_event.clear()
+        # One bad iteration must not kill the thread and silently stop all trading
+        try:
+            current_time = time.monotonic()  # Cooldowns use the monotonic clock so NTP/wall-clock jumps can't freeze trading
+            # Stale is per connection: a coin that just hasn't traded on a live socket still has a current price
+            feed_stale = current_time - last_frame_time > STALE_TICK_SEC
+            for symbol in symbols:
+                price = _prices[symbol]
+                ema = _emas[symbol]
+                if price == 0.0 or ema == 0.0:
+                    if DEBUG_ENABLED:
+                        logging.debug(f"Skipping {symbol} - price or EMA not ready")
+                    continue
+                if feed_stale:
+                    if DEBUG_ENABLED:
+                        logging.debug(f"Skipping {symbol} - no WebSocket frame for over {STALE_TICK_SEC}s")
+                    continue
+                last_trade = _last_trades[symbol]
+                if current_time - last_trade < COOLDOWN_SEC:
+                    if DEBUG_ENABLED:
+                        logging.debug(f"Skipping {symbol} - in cooldown (last trade: {last_trade})")
+                    continue
+                # Calculate volatility (standard deviation of last 30 prices) from the running sums kept by process_tick
+                count = len(_histories[symbol])
+                if count >= EMA_PERIOD:
+                    mean = _sums[symbol] / count
+                    variance = max(_sq_sums[symbol] / count - mean * mean, 0.0)
+                    volatility = (variance ** 0.5) / mean if mean > 0 else 0.0
+                    dynamic_threshold = THRESHOLD_PCT_SELL_BASE + volatility * SELL_VOLATILITY_SCALE
                 else:
-                    log = f"Skipped sell {symbol} - profit ${profit:.4f} not positive!"
-                    debug_logs.append(log)
-                    logging.debug(log)
-        # CPU throttling
-        if psutil.cpu_percent() > 80:
+                    dynamic_threshold = THRESHOLD_PCT_SELL_BASE
+                deviation = _deviations[symbol]  # process_tick is the single writer, computed against the same EMA
+                if DEBUG_ENABLED and abs(deviation) > THRESHOLD_PCT_BUY / 2:  # Steady-state ticks near the EMA aren't worth a log line
+                    logging.debug(f"{symbol} deviation: {deviation:.2f}%, dynamic sell threshold: {dynamic_threshold:.3f}%")
+                if deviation <= BUY_TRIGGER_PCT and _balances['USDT'] >= TRADE_AMOUNT_USD:
+                    execute_buy(symbol, TRADE_AMOUNT_USD)
+                    _last_trades[symbol] = current_time
+                sell_trigger = SELL_HIGH_TRIGGER_PCT if _high_profit[symbol] else dynamic_threshold - THRESHOLD_TOLERANCE
+                quantity = TRADE_AMOUNT_USD / price
+                if deviation >= sell_trigger and _balances[symbol] > quantity:
+                    profit = TRADE_AMOUNT_USD - (quantity * _bids[symbol]) - TRADE_FEE_USD
+                    if profit > 0:
+                        execute_sell(symbol, TRADE_AMOUNT_USD)
+                        _last_trades[symbol] = current_time
+                    else:
+                        if VERBOSE_DEBUG_LOGS or DEBUG_ENABLED:
+                            log = f"Skipped sell {symbol} - profit ${profit:.4f} not positive!"
+                            if VERBOSE_DEBUG_LOGS:
+                                debug_logs.append(log)
+                            logging.debug(log)
+        except Exception as e:
+            debug_logs.append(f"trading_loop error: {e!r}")
+            logging.error(f"trading_loop error: {e!r}")
+            time.sleep(1)
+            continue
+        # CPU throttling; passes can run per tick batch, so sample psutil about once a second
+        # (each call re-reads /proc/stat, and over shorter windows the reading is mostly noise)
+        now = time.monotonic()
+        if now >= next_cpu_check:
+            cpu_busy = psutil.cpu_percent() > 80
+            next_cpu_check = now + CPU_CHECK_INTERVAL_SEC
+        if cpu_busy:
             time.sleep(0.2)
-        else:
-            time.sleep(0.1)  # Faster loop for high trade volume
 
 trade_thread = threading.Thread(target=trading_loop)
 trade_thread.daemon = True
 trade_thread.start()
 
 # Section: Key Input Handler
+KEY_COMMANDS = {ord('q'): 'q', ord('Q'): 'q', ord('r'): 'r', ord('R'): 'r', ord('s'): 's', ord('S'): 's'}
 def key_input(stdscr):
     while True:
         try:
             key = stdscr.getch()
-            if key != -1 and chr(key).lower() in ['q', 'r', 's']:
-                debug_logs.append(f"Key pressed: {chr(key)}")
-                return chr(key).lower()
+            command = KEY_COMMANDS.get(key)
+            if command:
+                logging.debug(f"Key pressed: {key} ({command})")
+                return command
         except:
             pass
         time.sleep(0.01)
@@ -483,7 +694,36 @@ def title_screen(stdscr):
     stdscr.refresh()
     stdscr.getch()
 
+# Section: State Snapshot
+def snapshot():
+    # Copy everything the dashboard shows in one short critical section
+    with state_lock:
+        return {
+            'prices': dict(prices),
+            'changes': dict(changes),
+            'deviations': dict(deviations),
+            'emas': dict(emas),
+            'balances': dict(balances),
+            'invested': dict(invested),
+            'coin_profits': dict(coin_profits),
+            'total_profit': total_profit,
+            'total_trades': total_trades,
+            'trade_logs': list(trade_logs),
+        }
+
 # Section: Dashboard
+def draw(stdscr, row, col, text, attr=0):
+    # Only touch the window when the line changed since the last frame
+    if last_lines.get((row, col)) == (text, attr):
+        return
+    last_lines[(row, col)] = (text, attr)
+    stdscr.addstr(row, col, text, attr)
+    # Blank what's left of a longer previous line, stopping short of the right border
+    _, end_col = stdscr.getyx()
+    width = stdscr.getmaxyx()[1]
+    if end_col < width - 1:
+        stdscr.addstr(row, end_col, ' ' * (width - 1 - end_col))
+
 def dashboard(stdscr):
     curses.curs_set(0)
     stdscr.nodelay(True)
@@ -495,69 +735,90 @@ def dashboard(stdscr):
     curses.init_pair(3, curses.COLOR_CYAN, -1)
     curses.init_pair(4, curses.COLOR_MAGENTA, -1)
     curses.init_pair(5, curses.COLOR_WHITE, -1)
+    green, red, cyan, white = (curses.color_pair(k) for k in (1, 2, 3, 5))
+    bold_green = curses.A_BOLD | green
+    hline, vline = curses.ACS_HLINE, curses.ACS_VLINE
+    coin_prefixes = [f"{idx}. {coin['name']} ({coin['symbol']}): $" for idx, coin in enumerate(coins, 1)]
     instructions = "Automated trading running | r=reset | q=quit | s=sell all holdings after 10s"
     key_thread = threading.Thread(target=key_input, args=(stdscr,), daemon=True)
     key_thread.start()
+    layout = None
+    dirty.set()
     while True:
-        stdscr.clear()
-        height, width = stdscr.getmaxyx()
-        title = "Your Momma's Best Meme Trader Powered by Grok 4 by xAI"
-        stdscr.addstr(0, max(0, (width - len(title)) // 2), title, curses.A_BOLD | curses.color_pair(1))
-        stdscr.hline(1, 0, curses.ACS_HLINE, width)
-        stdscr.addstr(2, PADDING, instructions[:width-1 - PADDING], curses.color_pair(3))
-        prices_start_row = 4
-        stdscr.addstr(prices_start_row, PADDING, "Live Prices (Top Meme Coins by Volume on KuCoin):")
-        row = prices_start_row + 2
-        all_positive = True
-        total_value = balances['USDT']
-        for idx, coin in enumerate(coins, 1):
-            symbol = coin['symbol']
-            price = prices.get(symbol, 0.0)
-            change = changes.get(symbol, 0.0)
-            dev = deviations.get(symbol, 0.0)
-            if change < 0:
-                all_positive = False
-            color = 1 if change > 0 else (2 if change < 0 else 5)
-            price_str = f"{price:.10f}" if price < 1 else f"{price:.2f}"
-            bal = balances.get(symbol, 0.0)
-            inv = invested.get(symbol, 0.0)
-            prof = coin_profits.get(symbol, 0.0)
-            if price > 0:
-                total_value += bal * price
-            elif emas[symbol] > 0:
-                total_value += bal * emas[symbol]
-            display_str = f"{idx}. {coin['name']} ({symbol}): ${price_str} ({change:+.2f}%) | Dev: {dev:+.2f}% | Bal: {bal:.4f} | Inv: ${inv:.2f} | Prof: ${prof:.2f}"
-            stdscr.addstr(row, PADDING, display_str[:width-1 - PADDING], curses.color_pair(color))
-            row += 1
-        stdscr.hline(prices_start_row - 1, 0, curses.ACS_HLINE, width)
-        stdscr.hline(row, 0, curses.ACS_HLINE, width)
-        for r in range(prices_start_row - 1, row + 1):
-            stdscr.addch(r, 0, curses.ACS_VLINE)
-            stdscr.addch(r, width - 1, curses.ACS_VLINE)
-        trades_start_row = row + 2
-        stdscr.addstr(trades_start_row, PADDING, f"Trades (USDT: ${balances['USDT']:.2f} | Total Value: ${total_value:.2f} | Total Profit: ${total_profit:.2f} | Trades: {total_trades}):")
-        row = trades_start_row + 2
-        for log in trade_logs:
-            stdscr.addstr(row, PADDING, log[:width-1 - PADDING], curses.color_pair(3))
-            row += 1
-            if row >= height - 2:
-                break
-        stdscr.hline(trades_start_row - 1, 0, curses.ACS_HLINE, width)
-        stdscr.hline(row, 0, curses.ACS_HLINE, width)
-        for r in range(trades_start_row - 1, row + 1):
-            stdscr.addch(r, 0, curses.ACS_VLINE)
-            stdscr.addch(r, width - 1, curses.ACS_VLINE)
-        if all_positive and total_profit > 0 and row < height - 1:
-            stdscr.addstr(row + 1, (width - 20) // 2, "To the Moon! 🌕🚀", curses.A_BOLD | curses.color_pair(1))
-        stdscr.refresh()
+        # Only rebuild the frame when a tick, trade or resize changed something since the last one
+        if dirty.is_set():
+            dirty.clear()
+            snap = snapshot()
+            balances_snap = snap['balances']
+            height, width = stdscr.getmaxyx()
+            prices_start_row = 4
+            trades_start_row = prices_start_row + 2 + len(coins) + 2
+            logs = snap['trade_logs'][:max(1, height - 2 - (trades_start_row + 2))]
+            # Wipe the screen and draw the borders only when the size or box layout changes;
+            # otherwise draw() rewrites changed lines only
+            if layout != (height, width, len(logs)):
+                layout = (height, width, len(logs))
+                stdscr.erase()
+                last_lines.clear()
+                stdscr.hline(1, 0, hline, width)
+                boxes = ((prices_start_row - 1, trades_start_row - 2), (trades_start_row - 1, trades_start_row + 2 + len(logs)))
+                for top, bottom in boxes:
+                    stdscr.hline(top, 0, hline, width)
+                    stdscr.hline(bottom, 0, hline, width)
+                    for r in range(top, bottom + 1):
+                        stdscr.addch(r, 0, vline)
+                        stdscr.addch(r, width - 1, vline)
+            title = "Your Momma's Best Meme Trader Powered by Grok 4 by xAI"
+            draw(stdscr, 0, max(0, (width - len(title)) // 2), title, bold_green)
+            draw(stdscr, 2, PADDING, instructions[:width-1 - PADDING], cyan)
+            draw(stdscr, prices_start_row, PADDING, "Live Prices (Top Meme Coins by Volume on KuCoin):")
+            row = prices_start_row + 2
+            all_positive = True
+            total_value = balances_snap['USDT']
+            for coin, prefix in zip(coins, coin_prefixes):
+                symbol = coin['symbol']
+                price = snap['prices'].get(symbol, 0.0)
+                change = snap['changes'].get(symbol, 0.0)
+                dev = snap['deviations'].get(symbol, 0.0)
+                if change < 0:
+                    all_positive = False
+                color = green if change > 0 else (red if change < 0 else white)
+                bal = balances_snap.get(symbol, 0.0)
+                inv = snap['invested'].get(symbol, 0.0)
+                prof = snap['coin_profits'].get(symbol, 0.0)
+                # Value at the last price, falling back to the EMA (0.0 until seeded, so it adds nothing)
+                total_value += bal * (price if price > 0 else snap['emas'].get(symbol, 0.0))
+                key = (price, change, dev, bal, inv, prof)
+                cached = row_cache.get(symbol)
+                if cached is None or cached[0] != key:
+                    price_str = f"{price:.10f}" if price < 1 else f"{price:.2f}"
+                    cached = (key, prefix + f"{price_str} ({change:+.2f}%) | Dev: {dev:+.2f}% | Bal: {bal:.4f} | Inv: ${inv:.2f} | Prof: ${prof:.2f}")
+                    row_cache[symbol] = cached
+                display_str = cached[1]
+                draw(stdscr, row, PADDING, display_str[:width-1 - PADDING], color)
+                row += 1
+            trades_header = f"Trades (USDT: ${balances_snap['USDT']:.2f} | Total Value: ${total_value:.2f} | Total Profit: ${snap['total_profit']:.2f} | Trades: {snap['total_trades']}):"
+            draw(stdscr, trades_start_row, PADDING, trades_header[:width-1 - PADDING])
+            row = trades_start_row + 2
+            for log in logs:
+                draw(stdscr, row, PADDING, log[:width-1 - PADDING], cyan)
+                row += 1
+            if row < height - 1:
+                moon = "To the Moon! 🌕🚀" if all_positive and snap['total_profit'] > 0 else ""
+                draw(stdscr, row + 1, (width - 20) // 2, moon, bold_green)
+            stdscr.noutrefresh()
+            curses.doupdate()
         key = stdscr.getch()
-        if key != -1 and chr(key).lower() in ['q', 'r', 's']:
-            debug_logs.append(f"Key pressed: {chr(key)}")
-            if key == ord('q'):
+        if key == curses.KEY_RESIZE:
+            dirty.set()
+        command = KEY_COMMANDS.get(key)
+        if command:
+            logging.debug(f"Key pressed: {key} ({command})")
+            if command == 'q':
                 break
-            elif key == ord('r'):
+            elif command == 'r':
                 reset_simulation()
-            elif key == ord('s'):
+            elif command == 's':
                 sell_all()
 
 # Section: Main Entry
@@ -566,6 +827,6 @@ def main(stdscr):
     dashboard(stdscr)
 curses.wrapper(main)
 print("\nDebug Logs:")
-for dlog in debug_logs:
+for dlog in list(debug_logs):
     print(dlog)
 print(f"Bot exited. Total trades: {total_trades}, Profit: ${total_profit:.2f}. Fun sim – trade responsibly!")